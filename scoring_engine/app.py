@@ -8,12 +8,15 @@ Usage:
 Dashboard: http://<kali-ip>:8080
 """
 
+import gzip
 import logging
 import threading
 import time
-from datetime import datetime
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait
+from types import MappingProxyType
 
-from flask import Flask, jsonify, render_template
+from flask import Flask, jsonify, render_template, request
 
 import checks
 import config
@@ -31,29 +34,69 @@ log = logging.getLogger("scoring")
 
 # ---------------------------------------------------------------------------
 # Shared state (updated by the background thread)
+#
+# _state is an immutable snapshot.  The scheduler thread is the only writer
+# and publishes changes by rebinding the global to a new snapshot, which is
+# atomic; request threads just read the global once and use that snapshot,
+# so neither side needs a lock.
 # ---------------------------------------------------------------------------
-_lock = threading.Lock()
+_State = namedtuple("_State", [
+    "last_check_time",   # ISO string of last completed check
+    "next_run_at",       # time.monotonic() deadline of next round
+    "current_results",   # read-only service_id → {up, points_earned, message}
+    "round_score",
+    "is_checking",
+])
+
+_state = _State(
+    last_check_time=None,
+    next_run_at=None,
+    current_results=MappingProxyType({}),
+    round_score=0,
+    is_checking=False,
+)
+
 
-_state = {
-    "last_check_time": None,   # ISO string of last completed check
-    "next_check_in": 0,        # seconds until next round
-    "current_results": {},     # service_id → {up, points_earned, message}
-    "round_score": 0,
-    "is_checking": False,
-}
+def _update_state(**changes):
+    """Publish a new state snapshot (scheduler thread only)."""
+    global _state
+    _state = _state._replace(**changes)
 
 # ---------------------------------------------------------------------------
 # Background check loop
 # ---------------------------------------------------------------------------
 
+# One worker per service so a round takes as long as the slowest check,
+# not the sum of all of them.  Reused across rounds.
+_executor = ThreadPoolExecutor(
+    max_workers=len(config.SERVICES), thread_name_prefix="check"
+)
+
+# Multi-step checks (FTP, SMTP) can spend TIMEOUT on each step; anything
+# still running after this many seconds is scored DOWN for the round.
+ROUND_DEADLINE = checks.TIMEOUT * 2
+
+
 def _run_one_round():
-    """Execute checks for every service and persist results."""
+    """Execute checks for every service in parallel and persist results."""
     results = []
     round_score = 0
 
+    futures = {
+        svc["id"]: _executor.submit(checks.run_check, svc)
+        for svc in config.SERVICES
+    }
+    wait(futures.values(), timeout=ROUND_DEADLINE)
+
+    # Walk SERVICES (not completion order) so results and log lines keep
+    # the configured ordering.
     for svc in config.SERVICES:
+        future = futures[svc["id"]]
         try:
-            up, message = checks.run_check(svc)
+            if future.done():
+                up, message = future.result()
+            else:
+                up, message = False, f"Check did not finish within {ROUND_DEADLINE}s"
         except Exception as exc:
             up = False
             message = f"Check exception: {exc}"
@@ -75,13 +118,14 @@ def _run_one_round():
             message[:70],
         )
 
-    database.save_round(results, round_score, config.MAX_SCORE_PER_ROUND)
+    ts = database.save_round(results, round_score, config.MAX_SCORE_PER_ROUND)
 
-    with _lock:
-        _state["last_check_time"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        _state["round_score"] = round_score
-        _state["current_results"] = {r["service_id"]: r for r in results}
-        _state["is_checking"] = False
+    _update_state(
+        last_check_time=database.format_timestamp(ts),
+        round_score=round_score,
+        current_results=MappingProxyType({r["service_id"]: r for r in results}),
+        is_checking=False,
+    )
 
     log.info(
         "Round complete: %d/%d pts  |  cumulative: %d",
@@ -95,23 +139,17 @@ def _scheduler_loop():
     """Background thread: runs checks every CHECK_INTERVAL seconds."""
     # Run immediately on startup
     while True:
-        with _lock:
-            _state["is_checking"] = True
+        _update_state(is_checking=True)
         log.info("=== Starting check round ===")
         try:
             _run_one_round()
         except Exception as exc:
             log.error("Unhandled error in check round: %s", exc)
-            with _lock:
-                _state["is_checking"] = False
+            _update_state(is_checking=False)
 
-        # Count down to next round, updating next_check_in each second
-        for remaining in range(config.CHECK_INTERVAL, 0, -1):
-            with _lock:
-                _state["next_check_in"] = remaining
-            time.sleep(1)
-        with _lock:
-            _state["next_check_in"] = 0
+        # Readers derive the countdown from next_run_at, so one sleep is enough
+        _update_state(next_run_at=time.monotonic() + config.CHECK_INTERVAL)
+        time.sleep(config.CHECK_INTERVAL)
 
 
 # ---------------------------------------------------------------------------
@@ -119,13 +157,55 @@ def _scheduler_loop():
 # ---------------------------------------------------------------------------
 app = Flask(__name__)
 
+# Dashboard HTML and JSON compress well; tiny bodies aren't worth the CPU.
+_GZIP_MIMETYPES = {"text/html", "application/json"}
+_GZIP_MIN_BYTES = 500
+
+
+@app.after_request
+def _gzip_response(response):
+    """Gzip HTML/JSON responses for clients that send Accept-Encoding: gzip."""
+    if (response.status_code != 200
+            or response.direct_passthrough
+            or response.mimetype not in _GZIP_MIMETYPES
+            or "Content-Encoding" in response.headers):
+        return response
+    response.vary.add("Accept-Encoding")
+    if "gzip" not in request.headers.get("Accept-Encoding", "").lower():
+        return response
+    data = response.get_data()
+    if len(data) < _GZIP_MIN_BYTES:
+        return response
+    response.set_data(gzip.compress(data, compresslevel=6))
+    response.headers["Content-Encoding"] = "gzip"
+    return response
+
+
+def _next_check_in(state):
+    """Whole seconds until the next round, computed from a state snapshot."""
+    if state.next_run_at is None:
+        return 0
+    return max(0, int(state.next_run_at - time.monotonic()))
+
+
+# (current_results mapping, stats generation, display list) for the last
+# list built.  A new round publishes a new current_results object and every
+# save_round() bumps database.cache_generation(), so either change rebuilds
+# the list.  The generation is read before the stats query, so stats that
+# raced with a commit are filed under the old generation and never reused.
+_display_cache = (None, None, None)
+
 
 def _build_services_display():
     """Merge config, live status, and historical stats into one list for the template."""
-    stats = database.get_service_stats()
+    global _display_cache
+    results = _state.current_results
+    generation = database.cache_generation()
+    cached_results, cached_generation, cached_display = _display_cache
+    if cached_results is results and cached_generation == generation:
+        return cached_display
 
-    with _lock:
-        results = dict(_state["current_results"])
+    stats = database.get_service_stats()
 
     display = []
     for svc in config.SERVICES:
@@ -152,14 +232,13 @@ def _build_services_display():
             "total_checks": total_checks,
             "uptime_pct": uptime_pct,
         })
+    _display_cache = (results, generation, display)
     return display
 
 
 @app.route("/")
 def index():
-    with _lock:
-        state_snapshot = dict(_state)
-
+    state_snapshot = _state
     services = _build_services_display()
     recent_rounds = database.get_recent_rounds(15)
     score_history = database.get_score_history(30)
@@ -169,10 +248,10 @@ def index():
     return render_template(
         "index.html",
         services=services,
-        last_check_time=state_snapshot["last_check_time"],
-        next_check_in=state_snapshot["next_check_in"],
-        is_checking=state_snapshot["is_checking"],
-        round_score=state_snapshot["round_score"],
+        last_check_time=state_snapshot.last_check_time,
+        next_check_in=_next_check_in(state_snapshot),
+        is_checking=state_snapshot.is_checking,
+        round_score=state_snapshot.round_score,
         max_score_per_round=config.MAX_SCORE_PER_ROUND,
         cumulative_score=database.get_cumulative_score(),
         round_count=database.get_round_count(),
@@ -187,9 +266,8 @@ def index():
 @app.route("/api/status")
 def api_status():
     """JSON endpoint — polled by the dashboard JS for live updates."""
-    with _lock:
-        state_snapshot = dict(_state)
-        results = dict(_state["current_results"])
+    state_snapshot = _state
+    results = state_snapshot.current_results
 
     services_out = {}
     for svc in config.SERVICES:
@@ -203,10 +281,10 @@ def api_status():
         }
 
     return jsonify({
-        "last_check_time": state_snapshot["last_check_time"],
-        "next_check_in": state_snapshot["next_check_in"],
-        "is_checking": state_snapshot["is_checking"],
-        "round_score": state_snapshot["round_score"],
+        "last_check_time": state_snapshot.last_check_time,
+        "next_check_in": _next_check_in(state_snapshot),
+        "is_checking": state_snapshot.is_checking,
+        "round_score": state_snapshot.round_score,
         "max_score_per_round": config.MAX_SCORE_PER_ROUND,
         "cumulative_score": database.get_cumulative_score(),
         "round_count": database.get_round_count(),
@@ -216,8 +294,16 @@ def api_status():
 
 @app.route("/api/history")
 def api_history():
-    """Score-per-round history for Chart.js."""
-    return jsonify(database.get_score_history(30))
+    """
+    Score-per-round history for Chart.js, oldest first, as parallel arrays:
+    t = timestamps, s = round scores, m = max scores.
+    """
+    history = database.get_score_history(30)
+    return jsonify({
+        "t": [h["timestamp"] for h in history],
+        "s": [h["round_score"] for h in history],
+        "m": [h["max_score"] for h in history],
+    })
 
 
 # ---------------------------------------------------------------------------
@@ -5,7 +5,10 @@ Checks are designed to validate the service is actually functional,
 not just that the port is open.
 """
 
+import functools
+import ipaddress
 import socket
+import struct
 import ftplib
 import smtplib
 import urllib.request
@@ -19,15 +22,44 @@ except ImportError:
 
 TIMEOUT = 10  # seconds per check
 
+# check_http only inspects the start of the page, so ask the server for just
+# that much; servers that ignore Range still answer 200 with the full body.
+HTTP_READ_BYTES = 1024
+_HTTP_HEADERS = {
+    "User-Agent": "CCDC-Scoring/1.0",
+    "Range": f"bytes=0-{HTTP_READ_BYTES - 1}",
+}
+
 
 # ---------------------------------------------------------------------------
 # Low-level helpers
 # ---------------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=None)
+def _is_ipv4_literal(host):
+    try:
+        ipaddress.IPv4Address(host)
+        return True
+    except ValueError:
+        return False
+
+
 def _tcp_connect(host, port):
-    """Open a raw TCP connection and return the socket, or raise."""
-    s = socket.create_connection((host, port), timeout=TIMEOUT)
-    s.settimeout(TIMEOUT)
+    """
+    Open a raw TCP connection (with TIMEOUT applied) and return the socket,
+    or raise.  Every configured target is an IPv4 literal, so those connect
+    directly and skip the getaddrinfo() that create_connection() performs;
+    hostnames still go through create_connection().
+    """
+    if not _is_ipv4_literal(host):
+        return socket.create_connection((host, port), timeout=TIMEOUT)
+    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        s.settimeout(TIMEOUT)
+        s.connect((host, port))
+    except BaseException:
+        s.close()
+        raise
     return s
 
 
@@ -53,21 +85,23 @@ def check_http(host, port):
     HTTP deep check: verify the web server returns HTTP 200 and that
     the response body contains the company portal content
     ('Ludus Corporation' or 'Employee Portal').  A generic 200 from a
-    default/placeholder page is not enough.
+    default/placeholder page is not enough.  Only the first HTTP_READ_BYTES
+    are requested (206 Partial Content is accepted alongside 200).
     """
     url = f"http://{host}:{port}/"
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": "CCDC-Scoring/1.0"})
+        req = urllib.request.Request(url, headers=_HTTP_HEADERS)
         with urllib.request.urlopen(req, timeout=TIMEOUT) as resp:
-            body = resp.read(1024)
-            if resp.status != 200:
-                return False, f"HTTP {resp.status} — unexpected response"
+            body = resp.read(HTTP_READ_BYTES)
+            status = resp.status
+            if status not in (200, 206):
+                return False, f"HTTP {status} — unexpected response"
             if not body:
-                return False, "HTTP 200 but empty body"
+                return False, f"HTTP {status} but empty body"
             content = body.decode("utf-8", errors="replace").lower()
             if "ludus corporation" not in content and "employee portal" not in content:
-                return False, f"HTTP 200 but company portal content missing ({len(body)} bytes)"
-            return True, f"HTTP 200 OK — portal loaded ({len(body)}+ bytes)"
+                return False, f"HTTP {status} but company portal content missing ({len(body)} bytes)"
+            return True, f"HTTP {status} OK — portal loaded ({len(body)}+ bytes)"
     except urllib.error.HTTPError as e:
         return False, f"HTTP {e.code}: {e.reason}"
     except urllib.error.URLError as e:
@@ -184,15 +218,16 @@ def check_mysql(host, port):
                 return False, "Incomplete handshake"
             # MySQL packet: 3-byte length + 1-byte seq + payload
             # Payload byte 0 is the protocol version (10 = modern MySQL)
+            pkt_len = struct.unpack_from("<I", data, 0)[0] & 0xFFFFFF
             proto = data[4]
             if proto == 0x0a:
-                # Version string ends at first null byte after byte 5
-                try:
-                    null_idx = data.index(b"\x00", 5)
-                    version = data[5:null_idx].decode("ascii", errors="replace")
-                    return True, f"MySQL/MariaDB {version}"
-                except ValueError:
+                # Version string is NUL-terminated after byte 5; bound the
+                # search to 64 bytes and to the end of this packet.
+                null_idx = data.find(b"\x00", 5, min(4 + pkt_len, 5 + 64))
+                if null_idx == -1:
                     return True, "MySQL handshake OK (version unreadable)"
+                version = data[5:null_idx].decode("ascii", errors="replace")
+                return True, f"MySQL/MariaDB {version}"
             elif proto == 0xff:
                 # Error packet
                 err_msg = data[7:].decode("utf-8", errors="replace")[:60]
@@ -218,14 +253,24 @@ def check_dns(host, query, expected_ip=None):
     return _dns_raw_udp(host, query, expected_ip)
 
 
-def _dns_dnspython(host, query, expected_ip):
-    import dns.resolver
-    try:
+# Target DNS server IP → configured Resolver, reused across rounds
+_resolvers = {}
+
+
+def _get_resolver(host):
+    resolver = _resolvers.get(host)
+    if resolver is None:
         resolver = dns.resolver.Resolver(configure=False)
         resolver.nameservers = [host]
         resolver.timeout = TIMEOUT
         resolver.lifetime = TIMEOUT
-        answers = resolver.resolve(query, "A")
+        _resolvers[host] = resolver
+    return resolver
+
+
+def _dns_dnspython(host, query, expected_ip):
+    try:
+        answers = _get_resolver(host).resolve(query, "A")
         ips = [str(r) for r in answers]
         if expected_ip and expected_ip not in ips:
             return False, f"Expected {expected_ip}, got {ips}"
@@ -234,31 +279,39 @@ def _dns_dnspython(host, query, expected_ip):
         return False, f"DNS query failed: {e}"
 
 
+@functools.lru_cache(maxsize=None)
+def _build_dns_query(query):
+    """
+    Build a minimal DNS A-record query packet for `query`.
+    The query names are fixed in config, so each packet is built once.
+    """
+    txn_id = b"\xab\xcd"
+    flags = b"\x01\x00"          # standard query, recursion desired
+    qdcount = b"\x00\x01"
+    ancount = b"\x00\x00"
+    nscount = b"\x00\x00"
+    arcount = b"\x00\x00"
+    header = txn_id + flags + qdcount + ancount + nscount + arcount
+
+    # Encode QNAME
+    qname = b""
+    for label in query.split("."):
+        encoded = label.encode()
+        qname += bytes([len(encoded)]) + encoded
+    qname += b"\x00"
+
+    qtype = b"\x00\x01"   # A record
+    qclass = b"\x00\x01"  # IN class
+    return header + qname + qtype + qclass
+
+
 def _dns_raw_udp(host, query, expected_ip):
     """
     Minimal raw UDP DNS query for environments without dnspython.
-    Builds a DNS A-record query packet by hand and checks for a valid response.
+    Sends a hand-built A-record query packet and checks for a valid response.
     """
     try:
-        # Build a minimal DNS query for an A record
-        txn_id = b"\xab\xcd"
-        flags = b"\x01\x00"          # standard query, recursion desired
-        qdcount = b"\x00\x01"
-        ancount = b"\x00\x00"
-        nscount = b"\x00\x00"
-        arcount = b"\x00\x00"
-        header = txn_id + flags + qdcount + ancount + nscount + arcount
-
-        # Encode QNAME
-        qname = b""
-        for label in query.split("."):
-            encoded = label.encode()
-            qname += bytes([len(encoded)]) + encoded
-        qname += b"\x00"
-
-        qtype = b"\x00\x01"   # A record
-        qclass = b"\x00\x01"  # IN class
-        packet = header + qname + qtype + qclass
+        packet = _build_dns_query(query)
 
         with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
             s.settimeout(TIMEOUT)
@@ -415,44 +468,39 @@ def check_ssh(host, port):
 # Dispatcher
 # ---------------------------------------------------------------------------
 
+# check_type → callable(service); built once at import instead of walking
+# an if/elif chain on every check.
+_DISPATCH = {
+    "tcp": lambda svc: check_tcp(svc["host"], svc["port"]),
+    "http": lambda svc: check_http(svc["host"], svc["port"]),
+    "ftp": lambda svc: check_ftp(svc["host"], svc["port"]),
+    "smtp": lambda svc: check_smtp(svc["host"], svc["port"]),
+    "banner": lambda svc: check_banner(
+        svc["host"], svc["port"], svc.get("banner_expect"),
+    ),
+    "mysql": lambda svc: check_mysql(svc["host"], svc["port"]),
+    "dns": lambda svc: check_dns(
+        svc["host"],
+        svc.get("dns_query", "ludus.domain"),
+        svc.get("dns_expected_ip"),
+    ),
+    "ldap": lambda svc: check_ldap(svc["host"], svc["port"]),
+    "smb": lambda svc: check_smb(svc["host"], svc["port"]),
+    "imap_login": lambda svc: check_imap_login(
+        svc["host"], svc["port"],
+        svc.get("imap_user", "user"),
+        svc.get("imap_pass", "password"),
+    ),
+    "ssh": lambda svc: check_ssh(svc["host"], svc["port"]),
+}
+
+
 def run_check(service):
     """
     Run the appropriate check for a service definition.
     Returns (up: bool, message: str).
     """
-    ctype = service["check_type"]
-    host = service["host"]
-    port = service["port"]
-
-    if ctype == "tcp":
-        return check_tcp(host, port)
-    elif ctype == "http":
-        return check_http(host, port)
-    elif ctype == "ftp":
-        return check_ftp(host, port)
-    elif ctype == "smtp":
-        return check_smtp(host, port)
-    elif ctype == "banner":
-        return check_banner(host, port, service.get("banner_expect"))
-    elif ctype == "mysql":
-        return check_mysql(host, port)
-    elif ctype == "dns":
-        return check_dns(
-            host,
-            service.get("dns_query", "ludus.domain"),
-            service.get("dns_expected_ip"),
-        )
-    elif ctype == "ldap":
-        return check_ldap(host, port)
-    elif ctype == "smb":
-        return check_smb(host, port)
-    elif ctype == "imap_login":
-        return check_imap_login(
-            host, port,
-            service.get("imap_user", "user"),
-            service.get("imap_pass", "password"),
-        )
-    elif ctype == "ssh":
-        return check_ssh(host, port)
-    else:
-        return False, f"Unknown check type: {ctype}"
+    check = _DISPATCH.get(service["check_type"])
+    if check is None:
+        return False, f"Unknown check type: {service['check_type']}"
+    return check(service)
@@ -5,55 +5,40 @@ Kali lives on 10.{RANGE_ID}.99.x and services are on 10.{RANGE_ID}.10.x
 """
 
 import os
-import subprocess
+import socket
 
 
 def _detect_range_id():
     """
     Detect the Ludus range ID from Kali's IP (10.X.99.Y pattern).
-    Tries 'ip addr show' (searching common paths), then falls back to
-    parsing /proc/net/if_inet6 / /proc/net/fib_trie if ip(8) is absent.
+    Resolves the machine's own hostname with getaddrinfo() first, then
+    falls back to parsing /proc/net/fib_trie.  Neither path forks a
+    process, so importing this module stays cheap.
     """
-    # Common locations for 'ip' on Debian/Kali/Ubuntu
-    ip_candidates = [
-        "ip",
-        "/sbin/ip",
-        "/usr/sbin/ip",
-        "/bin/ip",
-        "/usr/bin/ip",
-    ]
-
-    for cmd in ip_candidates:
-        try:
-            result = subprocess.run(
-                [cmd, "addr", "show"],
-                capture_output=True, text=True, timeout=5,
-            )
-            if result.returncode != 0:
-                continue
-            for line in result.stdout.splitlines():
-                if "inet " not in line or "127.0.0.1" in line:
-                    continue
-                ip = line.strip().split()[1].split("/")[0]
-                parts = ip.split(".")
-                if len(parts) == 4 and parts[0] == "10" and parts[2] == "99":
-                    return int(parts[1])
-        except (FileNotFoundError, PermissionError, subprocess.TimeoutExpired):
-            continue
-        except Exception:
-            break
+    try:
+        hostname = socket.gethostname()
+        for _, _, _, _, sockaddr in socket.getaddrinfo(hostname, None, socket.AF_INET):
+            parts = sockaddr[0].split(".")
+            if len(parts) == 4 and parts[0] == "10" and parts[2] == "99":
+                return int(parts[1])
+    except OSError:
+        pass
 
-    # Fallback: parse /proc/net/fib_trie (Linux only, no external tool needed)
+    # Fallback: parse /proc/net/fib_trie (Linux only; the hostname often
+    # resolves to 127.0.1.1 via /etc/hosts).  Each address is a "|-- a.b.c.d"
+    # leaf; the machine's own addresses are followed by "/32 host LOCAL".
     try:
         with open("/proc/net/fib_trie") as f:
+            leaf = None
             for line in f:
                 line = line.strip()
-                if line.startswith("LOCAL") or not line[0].isdigit():
+                if line.startswith("|--"):
+                    leaf = line.split()[1]
                     continue
-                ip = line.split()[0]
-                parts = ip.split(".")
-                if (len(parts) == 4 and parts[0] == "10"
-                        and parts[2] == "99" and parts[3] != "255"):
+                if leaf is None or not line.startswith("/32 host LOCAL"):
+                    continue
+                parts = leaf.split(".")
+                if len(parts) == 4 and parts[0] == "10" and parts[2] == "99":
                     return int(parts[1])
     except Exception:
         pass
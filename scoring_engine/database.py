@@ -1,30 +1,109 @@
 """
 SQLite persistence layer for the scoring engine.
 Schema:
-  check_rounds   - one row per check cycle (timestamp, round score, max score)
+  check_rounds   - one row per check cycle (epoch timestamp, round score, max score)
   service_checks - one row per service per cycle (foreign key → check_rounds)
+  stats_totals   - running per-service totals, updated by save_round
+  meta           - running scalar totals (cumulative_score, round_count)
 """
 
+import contextlib
+import functools
 import os
 import sqlite3
+import threading
+import time
 from datetime import datetime
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "scores.db")
 
+# Read results only change when save_round() commits, so dashboard polling
+# is served from here.  (func name, args) → (value, expires_at)
+_cache = {}
 
-def _connect():
-    conn = sqlite3.connect(DB_PATH)
+# Bumped by save_round() after each commit.  A read that started under an
+# older generation may hold pre-commit data, so its result is not cached.
+# _cache_lock makes "check generation and store" atomic with "bump and clear".
+_cache_generation = 0
+_cache_lock = threading.Lock()
+
+
+def cache_generation():
+    """Current cache generation; changes every time save_round() commits."""
+    return _cache_generation
+
+
+def _memoize(ttl):
+    """Cache a read function's result for ttl seconds (cleared by save_round)."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args):
+            key = (func.__name__, args)
+            hit = _cache.get(key)
+            now = time.monotonic()
+            if hit is not None and hit[1] > now:
+                return hit[0]
+            generation = _cache_generation
+            value = func(*args)
+            with _cache_lock:
+                if generation == _cache_generation:
+                    _cache[key] = (value, now + ttl)
+            return value
+        return wrapper
+    return decorator
+
+
+_local = threading.local()
+
+# Dashboard reads share one connection across Flask request threads.
+# WAL lets it read while the scheduler writes; _read_lock serializes use.
+_read_conn = None
+_read_lock = threading.Lock()
+
+
+def _open(check_same_thread=True):
+    """
+    Open a tuned connection in autocommit mode (isolation_level=None).
+    Writers open their own transaction with BEGIN IMMEDIATE; `with conn:`
+    then commits or rolls it back, and is a no-op for plain reads.
+    """
+    conn = sqlite3.connect(
+        DB_PATH, check_same_thread=check_same_thread, isolation_level=None
+    )
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=30000000")
+    return conn
+
+
+def _connect():
+    """Return this thread's read/write connection, opening it on first use."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _local.conn = _open()
     return conn
 
 
+@contextlib.contextmanager
+def _reader():
+    """Hold the shared read-only connection for the duration of a query."""
+    global _read_conn
+    with _read_lock:
+        if _read_conn is None:
+            _read_conn = _open(check_same_thread=False)
+            _read_conn.execute("PRAGMA query_only=ON")
+        yield _read_conn
+
+
 def init_db():
     """Create tables if they don't exist."""
     with _connect() as conn:
         conn.executescript("""
             CREATE TABLE IF NOT EXISTS check_rounds (
                 id          INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp   TEXT    NOT NULL,
+                timestamp   INTEGER NOT NULL,   -- Unix epoch seconds
                 round_score INTEGER NOT NULL,
                 max_score   INTEGER NOT NULL
             );
@@ -40,71 +119,147 @@ def init_db():
             );
 
             CREATE INDEX IF NOT EXISTS idx_sc_round   ON service_checks(round_id);
-            CREATE INDEX IF NOT EXISTS idx_sc_service ON service_checks(service_id);
+
+            -- Covers per-service aggregates (service_id, SUM(up),
+            -- SUM(points_earned)) so they never touch the table rows.
+            -- Supersedes the old single-column idx_sc_service.
+            CREATE INDEX IF NOT EXISTS idx_sc_svc_cover
+                ON service_checks(service_id, up, points_earned);
+            DROP INDEX IF EXISTS idx_sc_service;
+
+            CREATE TABLE IF NOT EXISTS stats_totals (
+                service_id    TEXT    PRIMARY KEY,
+                total_checks  INTEGER NOT NULL,
+                up_count      INTEGER NOT NULL,
+                total_points  INTEGER NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS meta (
+                key   TEXT    PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+
+            -- Databases from before epoch timestamps stored local-time
+            -- 'YYYY-MM-DD HH:MM:SS' text; convert those rows in place.  Their
+            -- column keeps TEXT affinity, so reads CAST timestamp back.
+            UPDATE check_rounds
+                SET timestamp = CAST(strftime('%s', timestamp, 'utc') AS INTEGER)
+                WHERE timestamp LIKE '____-__-__ __:__:__';
+
+            -- Seed the running totals from any rows recorded before these
+            -- tables existed.  OR IGNORE makes this a no-op afterwards.
+            INSERT OR IGNORE INTO stats_totals
+                SELECT service_id, COUNT(*), SUM(up), SUM(points_earned)
+                FROM service_checks GROUP BY service_id;
+            INSERT OR IGNORE INTO meta
+                SELECT 'cumulative_score', COALESCE(SUM(round_score), 0) FROM check_rounds;
+            INSERT OR IGNORE INTO meta
+                SELECT 'round_count', COUNT(*) FROM check_rounds;
         """)
 
 
+@functools.lru_cache(maxsize=64)
+def format_timestamp(epoch):
+    """Render a stored epoch timestamp as local 'YYYY-MM-DD HH:MM:SS'."""
+    return datetime.fromtimestamp(epoch).strftime("%Y-%m-%d %H:%M:%S")
+
+
 def save_round(results, round_score, max_score):
     """
-    Persist one complete check cycle.
+    Persist one complete check cycle in a single write transaction.
     results: list of dicts with keys service_id, up, points_earned, message
+    Returns the round's epoch timestamp.
     """
-    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    global _cache_generation
+    ts = int(time.time())
     with _connect() as conn:
+        conn.execute("BEGIN IMMEDIATE")
         cur = conn.execute(
             "INSERT INTO check_rounds (timestamp, round_score, max_score) VALUES (?, ?, ?)",
             (ts, round_score, max_score),
         )
         round_id = cur.lastrowid
+        if results:
+            # One multi-row INSERT rather than a statement step per service
+            placeholders = ", ".join(["(?, ?, ?, ?, ?)"] * len(results))
+            params = []
+            for r in results:
+                params.extend((round_id, r["service_id"], 1 if r["up"] else 0,
+                               r["points_earned"], r["message"]))
+            conn.execute(
+                f"""INSERT INTO service_checks
+                    (round_id, service_id, up, points_earned, message)
+                    VALUES {placeholders}""",
+                params,
+            )
         conn.executemany(
-            """INSERT INTO service_checks
-               (round_id, service_id, up, points_earned, message)
-               VALUES (?, ?, ?, ?, ?)""",
+            """INSERT INTO stats_totals
+               (service_id, total_checks, up_count, total_points)
+               VALUES (?, 1, ?, ?)
+               ON CONFLICT(service_id) DO UPDATE SET
+                   total_checks = total_checks + 1,
+                   up_count     = up_count + excluded.up_count,
+                   total_points = total_points + excluded.total_points""",
             [
-                (round_id, r["service_id"], 1 if r["up"] else 0,
-                 r["points_earned"], r["message"])
+                (r["service_id"], 1 if r["up"] else 0, r["points_earned"])
                 for r in results
             ],
         )
+        conn.execute(
+            "UPDATE meta SET value = value + ? WHERE key = 'cumulative_score'",
+            (round_score,),
+        )
+        conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'round_count'")
+    with _cache_lock:
+        _cache_generation += 1
+        _cache.clear()
+    return ts
 
 
+@_memoize(ttl=30)
 def get_cumulative_score():
     """Sum of all round scores across the entire competition."""
-    with _connect() as conn:
-        row = conn.execute("SELECT COALESCE(SUM(round_score), 0) FROM check_rounds").fetchone()
-        return row[0]
+    with _reader() as conn:
+        row = conn.execute(
+            "SELECT value FROM meta WHERE key = 'cumulative_score'"
+        ).fetchone()
+        return row[0] if row else 0
 
 
+@_memoize(ttl=30)
 def get_round_count():
-    with _connect() as conn:
-        row = conn.execute("SELECT COUNT(*) FROM check_rounds").fetchone()
-        return row[0]
+    with _reader() as conn:
+        row = conn.execute(
+            "SELECT value FROM meta WHERE key = 'round_count'"
+        ).fetchone()
+        return row[0] if row else 0
 
 
+@_memoize(ttl=30)
 def get_recent_rounds(limit=20):
     """Return the most recent rounds, newest first."""
-    with _connect() as conn:
+    with _reader() as conn:
         rows = conn.execute(
-            "SELECT * FROM check_rounds ORDER BY id DESC LIMIT ?", (limit,)
+            """SELECT id, CAST(timestamp AS INTEGER) AS timestamp,
+                      round_score, max_score
+               FROM check_rounds ORDER BY id DESC LIMIT ?""",
+            (limit,),
         ).fetchall()
-        return [dict(r) for r in rows]
+        return [dict(r, timestamp=format_timestamp(r["timestamp"])) for r in rows]
 
 
+@_memoize(ttl=30)
 def get_service_stats():
     """
-    Aggregate per-service statistics across all rounds.
+    Per-service statistics across all rounds, read from the running
+    totals kept by save_round.
     Returns a dict keyed by service_id with:
       total_checks, up_count, total_points
     """
-    with _connect() as conn:
+    with _reader() as conn:
         rows = conn.execute("""
-            SELECT
-                service_id,
-                COUNT(*)        AS total_checks,
-                SUM(up)         AS up_count,
-                SUM(points_earned) AS total_points
-            FROM service_checks
-            GROUP BY service_id
+            SELECT service_id, total_checks, up_count, total_points
+            FROM stats_totals
         """).fetchall()
         return {r["service_id"]: dict(r) for r in rows}
 
@@ -114,7 +269,7 @@ def get_last_round_results():
     Return service_checks rows for the most recent round,
     keyed by service_id.
     """
-    with _connect() as conn:
+    with _reader() as conn:
         row = conn.execute(
             "SELECT id FROM check_rounds ORDER BY id DESC LIMIT 1"
         ).fetchone()
@@ -127,15 +282,20 @@ def get_last_round_results():
         return {r["service_id"]: dict(r) for r in rows}
 
 
+@_memoize(ttl=30)
 def get_score_history(limit=30):
     """
     Return (timestamp, round_score, max_score) for the last N rounds,
     oldest first — suitable for Chart.js datasets.
     """
-    with _connect() as conn:
+    with _reader() as conn:
         rows = conn.execute(
-            """SELECT timestamp, round_score, max_score
+            """SELECT CAST(timestamp AS INTEGER) AS timestamp,
+                      round_score, max_score
                FROM check_rounds ORDER BY id DESC LIMIT ?""",
             (limit,),
         ).fetchall()
-        return list(reversed([dict(r) for r in rows]))
+        return [
+            dict(r, timestamp=format_timestamp(r["timestamp"]))
+            for r in reversed(rows)
+        ]